@@ -2000,16 +2000,23 @@ class Group(System):
             self._owned_sizes = self._var_sizes['output'].copy()
             abs2idx = self._var_allprocs_abs2idx
             for io in ('input', 'output'):
-                sizes = self._var_sizes[io]
-                for name, meta in abs2meta[io].items():
-                    dist = meta['distributed']
+                # the owner of each variable is the lowest rank where it has nonzero size
+                nonzero = self._var_sizes[io] > 0
+                owners = np.argmax(nonzero, axis=0)
+                has_owner = np.any(nonzero, axis=0)
+                owner_list = owners.tolist()
+                for name in abs2meta[io]:
                     i = abs2idx[name]
-                    for rank in range(self.comm.size):
-                        if sizes[rank, i] > 0:
-                            owns[name] = rank
-                            if not dist and io == 'output':
-                                self._owned_sizes[rank + 1:, i] = 0  # zero out all dups
-                            break
+                    if has_owner[i]:
+                        owns[name] = owner_list[i]
+
+                if io == 'output':
+                    # zero out all dups of non-distributed outputs
+                    dups = np.arange(self.comm.size)[:, np.newaxis] > owners
+                    for name, meta in abs2meta[io].items():
+                        if meta['distributed']:
+                            dups[:, abs2idx[name]] = False
+                    self._owned_sizes[dups] = 0
 
                 if abs2discrete[io]:
                     prefix = self.pathname + '.' if self.pathname else ''
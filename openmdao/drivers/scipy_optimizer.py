@@ -12,6 +12,7 @@ from scipy.optimize import minimize
 from openmdao.core.constants import INF_BOUND
 from openmdao.core.driver import Driver, RecordingDebugging
 from openmdao.core.group import Group
+from openmdao.utils.array_utils import scaled_row_gather
 from openmdao.utils.class_util import WeakMethodWrapper
 from openmdao.utils.mpi import MPI
 
@@ -60,6 +61,10 @@ if Version(scipy_version) >= Version("1.4"):
     _supports_new_style.add('differential_evolution')
 _use_new_style = True  # Recommended to set to True
 
+# These accept vector valued "old-style" constraints, so all entries of a given type can be
+# handed to scipy as a single constraint with a single jacobian callback.
+_vector_con_optimizers = {'SLSQP'}
+
 CITATIONS = """
 @article{Hwang_maud_2018
  author = {Hwang, John T. and Martins, Joaquim R.R.A.},
@@ -107,13 +112,31 @@ class ScipyOptimizeDriver(Driver):
         Dictionary of solver-specific options. See the scipy.optimize.minimize documentation.
     _check_jac : bool
         Used internally to control when to perform singular checks on computed total derivs.
+    _any_group_has_approx : bool
+        True if any group in the model approximates its derivatives.
     _con_cache : dict
         Cached result of constraint evaluations because scipy asks for them in a separate function.
     _con_idx : dict
         Used for constraint bookkeeping in the presence of 2-sided constraints.
+    _vec_cons : dict
+        For optimizers that take vector valued constraints, maps constraint type ('eq' or 'ineq')
+        to the data needed by _vec_confunc and _vec_congradfunc.
+    _con_info : dict
+        Maps constraint name to a tuple of (linear, first jacobian row, negate, offset, upper),
+        where the last three are arrays describing how each entry is presented to scipy, so the
+        constraint callbacks don't have to inspect the metadata.
     _grad_cache : {}
         Cached result of nonlinear constraint derivatives because scipy asks for them in a separate
         function.
+    _grad_cache_key : bytes or None
+        Design point (as raw bytes) at which _grad_cache was computed.
+    _neg_grad_cache : np.ndarray or None
+        Negated copy of _grad_cache, used by _congradfunc for constraints that scipy sees with
+        flipped sign. Only built when first needed for the current gradient.
+    _neg_grad_cache_key : bytes or None
+        Value of _grad_cache_key when _neg_grad_cache was last filled, or None if it's out of date.
+    _empty_gradresult : ndarray
+        Empty gradient returned to scipy after an exception in _gradfunc.
     _exc_info : 3 item tuple
         Storage for exception and traceback information.
     _obj_and_nlcons : list
@@ -123,8 +146,14 @@ class ScipyOptimizeDriver(Driver):
         Copy of _designvars.
     _lincongrad_cache : np.ndarray
         Pre-calculated gradients of linear constraints.
+    _neg_lincongrad_cache : np.ndarray or None
+        Negated copy of _lincongrad_cache. Only built when first needed by _congradfunc.
     _desvar_array_cache : np.ndarray
         Cached array for setting design variables.
+    _obj_name : str or None
+        Name of the (single) objective, resolved once per run.
+    _model_ref : <Group> or None
+        The model being optimized. Only set during run.
     """
 
     def __init__(self, **kwargs):
@@ -153,16 +182,26 @@ class ScipyOptimizeDriver(Driver):
 
         self._scipy_optimize_result = None
         self._grad_cache = None
+        self._grad_cache_key = None
+        self._neg_grad_cache = None
+        self._neg_grad_cache_key = None
         self._con_cache = None
         self._con_idx = {}
+        self._con_info = {}
+        self._vec_cons = {}
         self._obj_and_nlcons = None
         self._dvlist = None
         self._lincongrad_cache = None
+        self._neg_lincongrad_cache = None
         self._desvar_array_cache = None
+        self._obj_name = None
+        self._model_ref = None
         self.fail = False
         self.iter_count = 0
         self._check_jac = False
+        self._any_group_has_approx = False
         self._exc_info = None
+        self._empty_gradresult = np.empty((1, 0))
         self._total_jac_format = 'array'
 
         self.cite = CITATIONS
@@ -257,6 +296,9 @@ class ScipyOptimizeDriver(Driver):
         self.iter_count = 0
         self._total_jac = None
         self._desvar_array_cache = None
+        self._model_ref = model
+        self._grad_cache_key = None
+        self._neg_grad_cache = self._neg_grad_cache_key = None
 
         self._check_for_missing_objective()
         self._check_for_invalid_desvar_values()
@@ -271,6 +313,12 @@ class ScipyOptimizeDriver(Driver):
         desvar_vals = self.get_design_var_values()
         self._dvlist = list(self._designvars)
 
+        # the singular jac check is skipped if any group approximates its derivatives
+        if self._check_jac:
+            self._any_group_has_approx = any(s._has_approx for s in
+                                             model.system_iter(include_self=True, recurse=True,
+                                                               typ=Group))
+
         # maxiter and disp get passed into scipy with all the other options.
         if 'maxiter' not in self.opt_settings:  # lets you override the value in options
             self.opt_settings['maxiter'] = self.options['maxiter']
@@ -282,6 +330,10 @@ class ScipyOptimizeDriver(Driver):
             size = desvar['global_size'] if desvar['distributed'] else desvar['size']
             ndesvar += size
         x_init = np.empty(ndesvar)
+        self._desvar_array_cache = np.empty(ndesvar)
+
+        # only a single objective is supported, so resolve it once rather than on every call
+        self._obj_name = next(iter(self._objs))
 
         # Initial Design Vars
         i = 0
@@ -314,6 +366,9 @@ class ScipyOptimizeDriver(Driver):
 
                     bounds.append((p_low, p_high))
 
+        # the model was last run at the initial design point
+        self._desvar_array_cache[:] = x_init
+
         if use_bounds and (opt in _supports_new_style) and _use_new_style:
             # For 'trust-constr' it is better to use the new type bounds, because it seems to work
             # better (for the current examples in the tests) with the "keep_feasible" option
@@ -349,6 +404,19 @@ class ScipyOptimizeDriver(Driver):
                     self._compute_totals(of=lincons, wrt=self._dvlist, return_format='array')
             else:
                 self._lincongrad_cache = None
+            self._neg_lincongrad_cache = None
+
+            # callbacks are shared by every constraint entry
+            con_val_func = WeakMethodWrapper(self, '_con_val_func')
+            con_jac_func = WeakMethodWrapper(self, '_con_jac_func')
+            confunc = WeakMethodWrapper(self, '_confunc')
+            if opt in _constraint_grad_optimizers:
+                congradfunc = WeakMethodWrapper(self, '_congradfunc')
+            else:
+                congradfunc = None
+
+            # entries for vector valued constraints, split into nonlinear and linear lists
+            vec_entries = {'eq': ([], []), 'ineq': ([], [])}
 
             # map constraints to index and instantiate constraints for scipy
             for name, meta in self._cons.items():
@@ -369,6 +437,22 @@ class ScipyOptimizeDriver(Driver):
                     self._con_idx[name] = i
                     i += size
 
+                # Note, scipy defines constraints to be satisfied when positive, which is the
+                # opposite of OpenMDAO. Each entry is given to scipy as (val + offset), or as
+                # (offset - val) where negate is True, and the extra entry of a double-sided
+                # constraint is (upper - val).
+                ctype = 'ineq' if equals is None else 'eq'
+                con_upper = np.broadcast_to(upper, (size,))
+                if equals is None:
+                    con_lower = np.broadcast_to(lower, (size,))
+                    negate = con_lower <= -INF_BOUND
+                    offset = np.where(negate, con_upper, -con_lower)
+                    dblcons = ~negate & (con_upper < INF_BOUND)
+                else:
+                    negate = dblcons = np.zeros(size, dtype=bool)
+                    offset = -np.broadcast_to(equals, (size,))
+                self._con_info[name] = (linear, self._con_idx[name], negate, offset, con_upper)
+
                 # In scipy constraint optimizers take constraints in two separate formats
 
                 if opt in _supports_new_style and _use_new_style:
@@ -392,56 +476,56 @@ class ScipyOptimizeDriver(Driver):
                                                lb=lower, ub=upper, keep_feasible=True)
                     else:
                         # NonlinearConstraint
-                        # Loop over every index separately,
-                        # because scipy calls each constraint by index.
-                        for j in range(size):
-                            # TODO add option for Hessian
-                            # Double-sided constraints are accepted by the algorithm
-                            args = [name, False, j]
-                            con = NonlinearConstraint(
-                                fun=signature_extender(
-                                    WeakMethodWrapper(self, '_con_val_func'), args),
-                                lb=lb, ub=ub,
-                                jac=signature_extender(
-                                    WeakMethodWrapper(self, '_congradfunc'), args)
-                            )
+                        # All entries are evaluated together, and scipy gets the whole block
+                        # of the jacobian in one call.
+                        # TODO add option for Hessian
+                        # Double-sided constraints are accepted by the algorithm
+                        args = (name,)
+                        con = NonlinearConstraint(
+                            fun=signature_extender(con_val_func, args),
+                            lb=lb, ub=ub,
+                            jac=signature_extender(con_jac_func, args)
+                        )
 
                     constraints.append(con)
+                elif opt in _vector_con_optimizers:
+                    # Gather the entries here, they are combined into one constraint per type
+                    # after all constraints have been processed.
+                    rows = self._con_idx[name] + np.arange(size)
+                    entries = vec_entries[ctype][linear]
+                    entries.append((name, slice(None), rows, np.where(negate, -1., 1.), offset))
+
+                    # Add extra entries for the double-sided ones
+                    dbl_idxs = np.nonzero(dblcons)[0]
+                    if dbl_idxs.size > 0:
+                        entries.append((name, dbl_idxs, rows[dbl_idxs],
+                                        -np.ones(dbl_idxs.size), con_upper[dbl_idxs]))
                 else:
                     # Type of constraints is list of dict
-
                     # Loop over every index separately,
                     # because scipy calls each constraint by index.
                     for j in range(size):
                         con_dict = {}
-                        if meta['equals'] is not None:
-                            con_dict['type'] = 'eq'
-                        else:
-                            con_dict['type'] = 'ineq'
-                        con_dict['fun'] = WeakMethodWrapper(self, '_confunc')
-                        if opt in _constraint_grad_optimizers:
-                            con_dict['jac'] = WeakMethodWrapper(self, '_congradfunc')
-                        con_dict['args'] = [name, False, j]
+                        con_dict['type'] = ctype
+                        con_dict['fun'] = confunc
+                        if congradfunc is not None:
+                            con_dict['jac'] = congradfunc
+                        con_dict['args'] = (name, False, j)
                         constraints.append(con_dict)
 
-                        if isinstance(upper, np.ndarray):
-                            upper = upper[j]
-
-                        if isinstance(lower, np.ndarray):
-                            lower = lower[j]
-
-                        dblcon = (upper < INF_BOUND) and (lower > -INF_BOUND)
-
                         # Add extra constraint if double-sided
-                        if dblcon:
+                        if dblcons[j]:
                             dcon_dict = {}
                             dcon_dict['type'] = 'ineq'
-                            dcon_dict['fun'] = WeakMethodWrapper(self, '_confunc')
-                            if opt in _constraint_grad_optimizers:
-                                dcon_dict['jac'] = WeakMethodWrapper(self, '_congradfunc')
-                            dcon_dict['args'] = [name, True, j]
+                            dcon_dict['fun'] = confunc
+                            if congradfunc is not None:
+                                dcon_dict['jac'] = congradfunc
+                            dcon_dict['args'] = (name, True, j)
                             constraints.append(dcon_dict)
 
+            if opt in _vector_con_optimizers:
+                constraints = self._setup_vector_constraints(vec_entries, ndesvar)
+
         # Provide gradients for optimizers that support it
         if opt in _gradient_optimizers:
             jac = self._gradfunc
@@ -554,6 +638,7 @@ class ScipyOptimizeDriver(Driver):
                 raise
         finally:
             self._total_jac = None
+            self._model_ref = None
 
         if self._exc_info is not None:
             self._reraise()
@@ -612,7 +697,15 @@ class ScipyOptimizeDriver(Driver):
         float
             Value of the objective function evaluated at the new design point.
         """
-        model = self._problem().model
+        model = self._model_ref
+        if model is None:
+            # called directly rather than by scipy during run, so the state that run sets up
+            # may not exist yet
+            model = self._problem().model
+            if self._desvar_array_cache is None:
+                self._desvar_array_cache = np.empty(len(x_new))
+            if self._obj_name is None:
+                self._obj_name = next(iter(self._objs))
 
         try:
 
@@ -620,22 +713,20 @@ class ScipyOptimizeDriver(Driver):
             if MPI:
                 model.comm.Bcast(x_new, root=0)
 
-            if self._desvar_array_cache is None:
-                self._desvar_array_cache = np.empty(x_new.shape, dtype=x_new.dtype)
-
+            # Stage x_new in our own contiguous float64 buffer, which is what the design vars
+            # are set from, regardless of the layout of the array scipy hands us.
             self._desvar_array_cache[:] = x_new
 
-            self._update_design_vars(x_new)
+            self._update_design_vars(self._desvar_array_cache)
 
             with RecordingDebugging(self._get_name(), self.iter_count, self) as rec:
                 self.iter_count += 1
                 with model._relevance.nonlinear_active('iter'):
                     self._run_solve_nonlinear()
 
-            # Get the objective function evaluations
-            for obj in self.get_objective_values().values():
-                f_new = obj
-                break
+            # Get the objective function evaluation
+            obj_name = self._obj_name
+            f_new = self._get_voi_val(obj_name, self._objs[obj_name], self._remote_objs)
 
             self._con_cache = self.get_constraint_values()
 
@@ -651,7 +742,7 @@ class ScipyOptimizeDriver(Driver):
 
         return f_new
 
-    def _con_val_func(self, x_new, name, dbl, idx):
+    def _con_val_func(self, x_new, name):
         """
         Return the value of the constraint function requested in args.
 
@@ -664,21 +755,48 @@ class ScipyOptimizeDriver(Driver):
             Array containing input values at new design point.
         name : str
             Name of the constraint to be evaluated.
-        dbl : bool
-            True if double sided constraint.
-        idx : float
-            Contains index into the constraint array.
 
         Returns
         -------
-        float
+        ndarray
             Value of the constraint function.
         """
         if self.options['optimizer'] == 'differential_evolution':
             # the DE opt will not have called this, so we do it here to update DV/resp values
             self._objfunc(x_new)
 
-        return self._con_cache[name][idx]
+        return self._con_cache[name]
+
+    def _con_jac_func(self, x_new, name):
+        """
+        Return the cached jacobian of the constraint function requested in args.
+
+        Used for optimizers which take the bounds of the constraints (e.g. trust-constr), so the
+        gradients are never negated.
+
+        Parameters
+        ----------
+        x_new : ndarray
+            Array containing input values at new design point.
+        name : str
+            Name of the constraint to be evaluated.
+
+        Returns
+        -------
+        ndarray
+            Jacobian of the constraint function wrt all inputs.
+        """
+        if self._exc_info is not None:
+            self._reraise()
+
+        if self._grad_cache is None:
+            # _gradfunc has not been called, meaning gradients are not
+            # used for the objective but are needed for the constraints
+            self._gradfunc(x_new)
+
+        _, row, negate, _, _ = self._con_info[name]
+
+        return self._grad_cache[row:row + len(negate)]
 
     def _confunc(self, x_new, name, dbl, idx):
         """
@@ -706,30 +824,123 @@ class ScipyOptimizeDriver(Driver):
         if self._exc_info is not None:
             self._reraise()
 
-        cons = self._con_cache
-        meta = self._cons[name]
-
-        # Equality constraints
-        equals = meta['equals']
-        if equals is not None:
-            if isinstance(equals, np.ndarray):
-                equals = equals[idx]
-            return cons[name][idx] - equals
-
-        # Note, scipy defines constraints to be satisfied when positive,
-        # which is the opposite of OpenMDAO.
-        upper = meta['upper']
-        if isinstance(upper, np.ndarray):
-            upper = upper[idx]
-
-        lower = meta['lower']
-        if isinstance(lower, np.ndarray):
-            lower = lower[idx]
-
-        if dbl or (lower <= -INF_BOUND):
-            return upper - cons[name][idx]
+        val = self._con_cache[name][idx]
+        _, _, negate, offset, upper = self._con_info[name]
+
+        if dbl:
+            return upper[idx] - val
+        elif negate[idx]:
+            return offset[idx] - val
         else:
-            return cons[name][idx] - lower
+            return val + offset[idx]
+
+    def _setup_vector_constraints(self, entries, ndesvar):
+        """
+        Combine constraint entries into one vector valued scipy constraint per type.
+
+        Scipy then makes a single function call and a single jacobian call per constraint type
+        instead of one call for every entry.
+
+        Parameters
+        ----------
+        entries : dict
+            Maps constraint type ('eq' or 'ineq') to a pair of lists, for nonlinear and linear
+            constraints respectively, of (name, indices, jacobian rows, sign, offset) tuples.
+        ndesvar : int
+            Size of the design vector.
+
+        Returns
+        -------
+        list of dict
+            The constraints in the format expected by scipy.
+        """
+        self._vec_cons = {}
+        constraints = []
+
+        for ctype, (nl_entries, lin_entries) in entries.items():
+            ordered = nl_entries + lin_entries
+            if not ordered:
+                continue
+
+            sign = np.concatenate([e[3] for e in ordered])
+            offset = np.concatenate([e[4] for e in ordered])
+            nl_rows = np.concatenate([e[2] for e in nl_entries] or [np.zeros(0, dtype=int)])
+            nnl = nl_rows.size
+
+            jac = np.empty((sign.size, ndesvar))
+            if lin_entries:
+                # linear constraint gradients don't change, so fill them in now
+                lin_rows = np.concatenate([e[2] for e in lin_entries])
+                np.multiply(self._lincongrad_cache[lin_rows], sign[nnl:, np.newaxis],
+                            out=jac[nnl:])
+
+            self._vec_cons[ctype] = ([(e[0], e[1]) for e in ordered], sign, offset,
+                                     nl_rows, sign[:nnl], jac)
+
+            constraints.append({'type': ctype,
+                                'fun': WeakMethodWrapper(self, '_vec_confunc'),
+                                'jac': WeakMethodWrapper(self, '_vec_congradfunc'),
+                                'args': (ctype,)})
+
+        return constraints
+
+    def _vec_confunc(self, x_new, ctype):
+        """
+        Return the values of all constraint entries of the given type.
+
+        Parameters
+        ----------
+        x_new : ndarray
+            Array containing input values at new design point.
+        ctype : str
+            Constraint type, 'eq' or 'ineq'.
+
+        Returns
+        -------
+        ndarray
+            Values of the constraint functions.
+        """
+        if self._exc_info is not None:
+            self._reraise()
+
+        cons = self._con_cache
+        parts, sign, offset, _, _, _ = self._vec_cons[ctype]
+
+        vals = np.concatenate([cons[name][idxs] for name, idxs in parts])
+        vals *= sign
+        vals += offset
+
+        return vals
+
+    def _vec_congradfunc(self, x_new, ctype):
+        """
+        Return the gradients of all constraint entries of the given type.
+
+        Parameters
+        ----------
+        x_new : ndarray
+            Array containing input values at new design point.
+        ctype : str
+            Constraint type, 'eq' or 'ineq'.
+
+        Returns
+        -------
+        ndarray
+            Gradients of the constraint functions wrt all inputs.
+        """
+        if self._exc_info is not None:
+            self._reraise()
+
+        _, _, _, nl_rows, nl_sign, jac = self._vec_cons[ctype]
+
+        if nl_rows.size > 0:
+            if self._grad_cache is None:
+                # _gradfunc has not been called, meaning gradients are not
+                # used for the objective but are needed for the constraints
+                self._gradfunc(x_new)
+            scaled_row_gather(self._grad_cache, nl_rows, nl_sign, jac[:nl_rows.size])
+
+        return jac
 
     def _gradfunc(self, x_new):
         """
@@ -747,20 +958,23 @@ class ScipyOptimizeDriver(Driver):
         ndarray
             Gradient of objective with respect to input array.
         """
-        prob = self._problem()
-        model = prob.model
+        # Derivatives are computed where the model was last run, which is not always x_new
+        # (trust-constr asks for the gradient before the objective), so key on that point.
+        # If the jacobian there was already computed, a new solve would give the same answer.
+        key = self._desvar_array_cache.tobytes()
+        if key == self._grad_cache_key:
+            return self._grad_cache[0, :]
 
         try:
+            self._grad_cache_key = self._neg_grad_cache_key = None
             grad = self._compute_totals(of=self._obj_and_nlcons, wrt=self._dvlist,
                                         return_format=self._total_jac_format)
             self._grad_cache = grad
+            self._grad_cache_key = key
 
             # First time through, check for zero row/col.
             if self._check_jac and self._total_jac is not None:
-                for subsys in model.system_iter(include_self=True, recurse=True, typ=Group):
-                    if subsys._has_approx:
-                        break
-                else:
+                if not self._any_group_has_approx:
                     raise_error = self.options['singular_jac_behavior'] == 'error'
                     self._total_jac.check_total_jac(raise_error=raise_error,
                                                     tol=self.options['singular_jac_tol'])
@@ -769,7 +983,7 @@ class ScipyOptimizeDriver(Driver):
         except Exception:
             if self._exc_info is None:  # only record the first one
                 self._exc_info = sys.exc_info()
-            return np.array([[]])
+            return self._empty_gradresult
 
         # print("Gradients calculated for objective")
         # print('   xnew', x_new)
@@ -803,37 +1017,35 @@ class ScipyOptimizeDriver(Driver):
         if self._exc_info is not None:
             self._reraise()
 
-        meta = self._cons[name]
+        linear, row, negate, _, _ = self._con_info[name]
+
+        # double-sided constraints are split, and the extra one is always negated
+        negated = dbl or negate[idx]
 
-        if meta['linear']:
+        if linear:
             grad = self._lincongrad_cache
+            if negated:
+                if self._neg_lincongrad_cache is None:
+                    self._neg_lincongrad_cache = -grad
+                grad = self._neg_lincongrad_cache
         else:
             if self._grad_cache is None:
                 # _gradfunc has not been called, meaning gradients are not
                 # used for the objective but are needed for the constraints
                 self._gradfunc(x_new)
             grad = self._grad_cache
-
-        grad_idx = self._con_idx[name] + idx
-
-        # print("Constraint Gradient returned")
-        # print('   xnew', x_new)
-        # print('   grad', name, 'idx', idx, grad[grad_idx, :])
-
-        # Equality constraints
-        if meta['equals'] is not None:
-            return grad[grad_idx, :]
-
-        # Note, scipy defines constraints to be satisfied when positive,
-        # which is the opposite of OpenMDAO.
-        lower = meta['lower']
-        if isinstance(lower, np.ndarray):
-            lower = lower[idx]
-
-        if dbl or (lower <= -INF_BOUND):
-            return -grad[grad_idx, :]
-        else:
-            return grad[grad_idx, :]
+            if negated:
+                # negate all rows at once, the first time a negated row of this gradient
+                # is requested, rather than one row per call
+                neg_grad = self._neg_grad_cache
+                if self._neg_grad_cache_key is None:
+                    if neg_grad is None or neg_grad.shape != grad.shape:
+                        neg_grad = self._neg_grad_cache = np.empty_like(grad)
+                    np.negative(grad, out=neg_grad)
+                    self._neg_grad_cache_key = self._grad_cache_key
+                grad = neg_grad
+
+        return grad[row + idx, :]
 
     def _reraise(self):
         """
@@ -867,7 +1079,20 @@ def signature_extender(fcn, extra_args):
     callable
         The function with the signature expected by the driver.
     """
-    def closure(x, *args):
-        return fcn(x, *extra_args)
+    # Specialize on the number of extra args so the common cases don't re-splat a tuple
+    # on every call.
+    extra_args = tuple(extra_args)
+
+    if not extra_args:
+        def closure(x, *args):
+            return fcn(x)
+    elif len(extra_args) == 1:
+        arg0, = extra_args
+
+        def closure(x, *args):
+            return fcn(x, arg0)
+    else:
+        def closure(x, *args):
+            return fcn(x, *extra_args)
 
     return closure
@@ -923,6 +923,32 @@ class TestScipyOptimizeDriver(unittest.TestCase):
         obj = prob['o']
         assert_near_equal(obj, 20.0, 1e-6)
 
+    def test_dbl_sided_con_array_mixed(self):
+        # only the second entry of the constraint is double-sided
+        prob = om.Problem()
+        model = prob.model
+
+        model.add_subsystem('comp', om.ExecComp(['f = -x[0] - x[1]', 'c = x'],
+                                                x=np.zeros(2), c=np.zeros(2)),
+                            promotes=['*'])
+
+        prob.set_solver_print(level=0)
+
+        prob.driver = om.ScipyOptimizeDriver(optimizer='SLSQP', tol=1e-9, disp=False)
+
+        model.add_design_var('x', lower=-50.0, upper=50.0)
+        model.add_objective('f')
+        model.add_constraint('c', lower=np.array([0.0, 0.0]), upper=np.array([1e30, 10.0]))
+
+        prob.setup()
+
+        failed = not prob.run_driver().success
+
+        self.assertFalse(failed, "Optimization failed, result =\n" +
+                                 str(prob.driver._scipy_optimize_result))
+
+        assert_near_equal(prob['x'], [50.0, 10.0], 1e-6)
+
     def test_simple_array_comp2D_array_lo_hi(self):
 
         prob = om.Problem()
@@ -1307,6 +1333,46 @@ class TestScipyOptimizeDriver(unittest.TestCase):
         self.assertTrue(prob['c'] < 10)
         self.assertTrue(prob['c'] > 0)
 
+    @unittest.skipUnless(ScipyVersion >= Version("1.1"),
+                         "scipy >= 1.1 is required.")
+    def test_trust_constr_grad_reuse(self):
+        # trust-constr asks for gradients repeatedly without rerunning the model, so
+        # those requests should not trigger another total derivative solve.
+        prob = om.Problem()
+        model = prob.model
+
+        model.add_subsystem('comp', Paraboloid(), promotes=['*'])
+
+        prob.driver = driver = om.ScipyOptimizeDriver(optimizer='trust-constr', tol=1e-8,
+                                                      disp=False)
+
+        model.add_design_var('x', lower=-50.0, upper=50.0)
+        model.add_design_var('y', lower=-50.0, upper=50.0)
+        model.add_objective('f_xy')
+
+        prob.setup()
+
+        counts = {'grad': 0, 'totals': 0}
+        gradfunc = driver._gradfunc
+        compute_totals = driver._compute_totals
+
+        def counting_gradfunc(x_new):
+            counts['grad'] += 1
+            return gradfunc(x_new)
+
+        def counting_compute_totals(*args, **kwargs):
+            counts['totals'] += 1
+            return compute_totals(*args, **kwargs)
+
+        driver._gradfunc = counting_gradfunc
+        driver._compute_totals = counting_compute_totals
+
+        prob.run_driver()
+
+        assert_near_equal(prob['x'], 6.66666667, 1e-4)
+        assert_near_equal(prob['y'], -7.33333333, 1e-4)
+        self.assertLess(counts['totals'], counts['grad'])
+
     @unittest.skipUnless(ScipyVersion >= Version("1.1"),
                          "scipy >= 1.1 is required.")
     def test_trust_constr_hess_option(self):
@@ -1429,6 +1495,28 @@ class TestScipyOptimizeDriver(unittest.TestCase):
 
         assert_near_equal(prob['c'], 1.0, 1e-2)
 
+    @unittest.skipUnless(ScipyVersion >= Version("1.1"),
+                         "scipy >= 1.1 is required.")
+    def test_trust_constr_vector_con(self):
+        # every entry of a vector constraint must be enforced
+        prob = om.Problem()
+        model = prob.model
+
+        model.add_subsystem('comp', om.ExecComp(['f = sum(x**2)', 'c = x'],
+                                                x=np.ones(2), c=np.ones(2)),
+                            promotes=['*'])
+
+        prob.driver = om.ScipyOptimizeDriver(optimizer='trust-constr', tol=1e-8, disp=False)
+
+        model.add_design_var('x', lower=-10.0, upper=10.0)
+        model.add_objective('f')
+        model.add_constraint('c', lower=np.array([1.0, 2.0]))
+
+        prob.setup()
+        prob.run_driver()
+
+        assert_near_equal(prob['x'], [1.0, 2.0], 1e-4)
+
     @unittest.skipUnless(ScipyVersion >= Version("1.2"),
                          "scipy >= 1.2 is required.")
     def test_trust_constr_bounds(self):
@@ -6,18 +6,26 @@ import io
 from openmdao.utils.testing_utils import use_tempdirs
 
 
+def _fast_sqlite_recorder(filename):
+    # these tests only compare variable listings, so skip writing the (large) viewer data
+    return om.SqliteRecorder(filename, record_viewer_data=False)
+
+
 @use_tempdirs
 class ListOutputsTest(unittest.TestCase):
 
-    def test_invalid_return_format(self):
+    def _run_paraboloid(self):
+        # run a recorded ParaboloidProblem and return it along with its last recorded case
         prob = ParaboloidProblem()
-        rec = om.SqliteRecorder('test_list_outputs.db')
-        prob.model.add_recorder(rec)
+        prob.model.add_recorder(_fast_sqlite_recorder('test_list_outputs.db'))
 
         prob.setup()
         prob.run_model()
 
-        case = om.CaseReader('test_list_outputs.db').get_case(-1)
+        return prob, om.CaseReader('test_list_outputs.db').get_case(-1)
+
+    def test_invalid_return_format(self):
+        prob, case = self._run_paraboloid()
 
         with self.assertRaises(ValueError) as cm:
             case.list_inputs(return_format=dict)
@@ -40,15 +48,7 @@ class ListOutputsTest(unittest.TestCase):
         Confirm that includes/excludes has the same result between System.list_inputs() and
         Case.list_inputs(), and between System.list_outputs() and Case.list_outputs().
         """
-
-        prob = ParaboloidProblem()
-        rec = om.SqliteRecorder('test_list_outputs.db')
-        prob.model.add_recorder(rec)
-
-        prob.setup()
-        prob.run_model()
-
-        read_p = om.CaseReader('test_list_outputs.db').get_case(-1)
+        prob, read_p = self._run_paraboloid()
 
         prob_out = io.StringIO()
         rec_out = io.StringIO()
@@ -119,7 +119,7 @@ class ListOutputsTest(unittest.TestCase):
         p.model.add_objective('f')
 
         p.driver = om.ScipyOptimizeDriver(optimizer='SLSQP')
-        p.driver.add_recorder(om.SqliteRecorder('driver_cases.db'))
+        p.driver.add_recorder(_fast_sqlite_recorder('driver_cases.db'))
         p.driver.recording_options['includes'] = ['*']
 
         p.setup()
@@ -837,6 +837,65 @@ if numba is None:
         """
         return not np.any(a)
 
+    def scaled_row_gather(arr, rows, scale, out):
+        """
+        Fill out with the given rows of arr, each multiplied by the corresponding scale factor.
+
+        Parameters
+        ----------
+        arr : ndarray
+            2D array to gather rows from.
+        rows : ndarray
+            Indices of the rows of arr to gather.
+        scale : ndarray
+            Scale factor for each gathered row.
+        out : ndarray
+            2D array of shape (rows.size, arr.shape[1]) where the result is stored.
+
+        Returns
+        -------
+        ndarray
+            The out array.
+        """
+        return np.multiply(arr[rows], scale[:, np.newaxis], out=out)
+
+    def map_dist_indices(inds, sizes, offsets, out):
+        """
+        Map indices into a distributed variable to indices into the full distributed vector.
+
+        Entries of inds that are outside of the distributed variable leave out unchanged.
+
+        Parameters
+        ----------
+        inds : ndarray
+            Indices into the variable's values stacked in rank order.
+        sizes : ndarray
+            Size of the variable on each rank.
+        offsets : ndarray
+            Offset of the variable within the full vector on each rank.
+        out : ndarray
+            Array of the same size as inds where the result is stored.
+
+        Returns
+        -------
+        ndarray
+            The out array.
+        """
+        ends = np.cumsum(sizes)
+
+        # The rank that each index is on. Ranks where the variable has zero size are skipped
+        # because their end is the same as the end of the rank before them.
+        ranks = np.searchsorted(ends, inds, side='right')
+
+        on_ranks = np.logical_and(inds >= 0, ranks < ends.size)
+        if not np.all(on_ranks):
+            inds = inds[on_ranks]
+            ranks = ranks[on_ranks]
+
+        out[on_ranks] = inds + (offsets - (ends - sizes))[ranks]
+
+        return out
+
 else:
 
     @numba.jit(nopython=True, nogil=True)
@@ -912,3 +971,67 @@ else:
             if a[i] != 0.:
                 return False
         return True
+
+    @numba.jit(nopython=True, nogil=True)
+    def scaled_row_gather(arr, rows, scale, out):
+        """
+        Fill out with the given rows of arr, each multiplied by the corresponding scale factor.
+
+        Unlike the numpy version, this doesn't create a temporary array of the gathered rows.
+
+        Parameters
+        ----------
+        arr : ndarray
+            2D array to gather rows from.
+        rows : ndarray
+            Indices of the rows of arr to gather.
+        scale : ndarray
+            Scale factor for each gathered row.
+        out : ndarray
+            2D array of shape (rows.size, arr.shape[1]) where the result is stored.
+
+        Returns
+        -------
+        ndarray
+            The out array.
+        """
+        ncols = out.shape[1]
+        for i in range(len(rows)):
+            r = rows[i]
+            s = scale[i]
+            for j in range(ncols):
+                out[i, j] = s * arr[r, j]
+        return out
+
+    @numba.jit(nopython=True, nogil=True)
+    def map_dist_indices(inds, sizes, offsets, out):
+        """
+        Map indices into a distributed variable to indices into the full distributed vector.
+
+        Entries of inds that are outside of the distributed variable leave out unchanged.
+        Unlike the numpy version, this doesn't create any temporary index or mask arrays.
+
+        Parameters
+        ----------
+        inds : ndarray
+            Indices into the variable's values stacked in rank order.
+        sizes : ndarray
+            Size of the variable on each rank.
+        offsets : ndarray
+            Offset of the variable within the full vector on each rank.
+        out : ndarray
+            Array of the same size as inds where the result is stored.
+
+        Returns
+        -------
+        ndarray
+            The out array.
+        """
+        ends = np.cumsum(sizes)
+        for i in range(len(inds)):
+            ind = inds[i]
+            if ind >= 0:
+                rank = np.searchsorted(ends, ind, side='right')
+                if rank < len(ends):
+                    out[i] = ind + offsets[rank] - (ends[rank] - sizes[rank])
+        return out
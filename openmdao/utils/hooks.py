@@ -303,8 +303,16 @@ class _HookDecorator(object):
         if inst is None:
             return
 
+        expired = False
         for hook in hooks:
             hook(inst, args, kwargs, ret)
+            if hook.ncalls == 0:
+                expired = True
+
+        # hooks that have used up their calls or were deactivated will never run again, so
+        # drop them rather than checking them on every call of the method
+        if expired:
+            hooks[:] = [hook for hook in hooks if hook.ncalls != 0]
 
     def __call__(self, *args, **kwargs):
         """
@@ -322,9 +330,11 @@ class _HookDecorator(object):
         object
             The return value of the function.
         """
-        self._run_hooks(self.pre_hooks, args, kwargs)
+        if self.pre_hooks:
+            self._run_hooks(self.pre_hooks, args, kwargs)
         ret = self.func(*args, **kwargs)
-        self._run_hooks(self.post_hooks, args, kwargs, ret)
+        if self.post_hooks:
+            self._run_hooks(self.post_hooks, args, kwargs, ret)
         return ret
 
 
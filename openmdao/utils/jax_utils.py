@@ -3,20 +3,36 @@ Utilities for the use of jax in combination with OpenMDAO.
 """
 from collections.abc import Callable
 
-try:
-    import jax
-except ImportError:
-    jax = None
 
+def _identity(f):
+    """
+    Return the given function unchanged.
+
+    Parameters
+    ----------
+    f : Callable
+        The function or method.
+
+    Returns
+    -------
+    Callable
+        The same function.
+    """
+    return f
 
-def jit_stub(f, *args, **kwargs):
+
+def jit_stub(f=None, *args, **kwargs):
     """
     Provide a dummy jit decorator for use if jax is not available.
 
+    The function is returned as is, without any wrapper, so calling it costs no more than
+    calling the original function.
+
     Parameters
     ----------
-    f : Callable
-        The function or method to be wrapped.
+    f : Callable or None
+        The function or method to be wrapped. If None, return a decorator, which allows the
+        stub to be used as @jit_stub(static_argnums=...).
     *args : list
         Positional arguments.
     **kwargs : dict
@@ -27,6 +43,8 @@ def jit_stub(f, *args, **kwargs):
     Callable
         The decorated function.
     """
+    if f is None:
+        return _identity
     return f
 
 
@@ -57,7 +75,10 @@ def register_jax_component(comp_class):
     RuntimeError
         If jax is not available.
     """
-    if jax is None:
+    # jax is slow to import, so only import it when it's actually needed
+    try:
+        import jax
+    except ImportError:
         raise RuntimeError("jax is not available. "
                            "Try 'pip install openmdao[jax]' with Python>=3.8.")
 
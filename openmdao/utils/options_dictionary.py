@@ -35,6 +35,89 @@ def check_valid(name, value):
     raise ValueError(f"Option '{name}' with value {value} is not valid.")
 
 
+def _expected_types_str(types):
+    """
+    Return the description of the acceptable types used in type error messages.
+
+    Parameters
+    ----------
+    types : type or tuple of types or None
+        The acceptable types of the option.
+
+    Returns
+    -------
+    str or None
+        The description, or None if types is None.
+    """
+    if types is None:
+        return None
+    if isinstance(types, (set, tuple, list)):
+        typs = tuple([type_.__name__ for type_ in types])
+        return f"one of types {typs}"
+    return f"type '{types.__name__}'"
+
+
+def _make_valid_check(meta):
+    """
+    Return a function that returns True if a value passes the values, types and bounds checks.
+
+    The returned function only tells whether a value is valid, so values that fail it must go
+    through OptionsDictionary._assert_valid to get the proper error message.
+
+    Parameters
+    ----------
+    meta : dict
+        Metadata of the declared option.
+
+    Returns
+    -------
+    function or None
+        The check function, or None if every value must go through _assert_valid.
+    """
+    values = meta['values']
+    types = meta['types']
+    lower = meta['lower']
+    upper = meta['upper']
+
+    if values is not None:
+        if types is list:
+            return None
+
+        def check(value):
+            return value in values
+
+    elif types is not None:
+        def check(value):
+            return isinstance(value, types)
+
+    else:
+        check = None
+
+    if lower is not None or upper is not None:
+        type_check = check
+
+        def check(value):
+            if type_check is not None and not type_check(value):
+                return False
+            if upper is not None and value > upper:
+                return False
+            if lower is not None and value < lower:
+                return False
+            return True
+
+    if check is None:
+        def check(value):
+            return True
+
+    if meta['allow_none']:
+        not_none_check = check
+
+        def check(value):
+            return value is None or not_none_check(value)
+
+    return check
+
+
 class OptionsDictionary(object):
     """
     Dictionary with pre-declaration of keys for value-checking and default values.
@@ -62,9 +145,12 @@ class OptionsDictionary(object):
         If True, no options can be set after declaration.
     _all_recordable : bool
         Flag to determine if all options in UserOptions are recordable.
-    _context_cache : dict
-        A dictionary to store cached option/value pairs when using the
-        OptionsDictionary as a context manager.
+    _valid_checks : dict
+        Maps option name to a function, specialized to that option's declaration, that tells
+        whether a value passes its values, types and bounds checks.
+    _table_cache : dict
+        Maps the (fmt, missingval, max_width) arguments of to_table to the table rows it was last
+        called with and the resulting string, so an unchanged table isn't rendered again.
     """
 
     def __init__(self, parent_name=None, read_only=False):
@@ -75,7 +161,8 @@ class OptionsDictionary(object):
         self._parent_name = parent_name
         self._read_only = read_only
         self._all_recordable = True
-        self._context_cache = {}
+        self._valid_checks = {}
+        self._table_cache = {}
 
     def __getstate__(self):
         """
@@ -86,12 +173,29 @@ class OptionsDictionary(object):
         dict
             State to get.
         """
-        if self._all_recordable:
-            return self.__dict__
-        else:
-            state = self.__dict__.copy()
+        state = self.__dict__.copy()
+        # rendered tables are cheap to regenerate, so don't carry them along
+        state.pop('_table_cache', None)
+        state.pop('_valid_checks', None)
+        if not self._all_recordable:
             state['_dict'] = {key: val for key, val in state['_dict'].items() if val['recordable']}
-            return state
+        return state
+
+    def __setstate__(self, state):
+        """
+        Restore state from the given dict.
+
+        Parameters
+        ----------
+        state : dict
+            State to restore.
+        """
+        self.__dict__.update(state)
+        self._table_cache = {}
+        for meta in self._dict.values():
+            if 'expected_types' not in meta:  # options pickled by an older version
+                meta['expected_types'] = _expected_types_str(meta['types'])
+        self._valid_checks = {name: _make_valid_check(meta) for name, meta in self._dict.items()}
 
     def __repr__(self):
         """
@@ -194,6 +298,19 @@ class OptionsDictionary(object):
             else:
                 rows.append([key, default, acceptable_values, acceptable_types, desc])
 
+        # rendering the table is much more expensive than building the rows, so reuse the last
+        # rendering in this format if the rows haven't changed
+        cache_key = (fmt, missingval, max_width)
+        rows_key = repr((hdrs, rows))
+        if not display:
+            try:
+                cached_rows_key, cached_tab = self._table_cache[cache_key]
+            except KeyError:
+                pass
+            else:
+                if cached_rows_key == rows_key:
+                    return cached_tab
+
         kwargs = {
             'tablefmt': fmt,
             'headers': hdrs,
@@ -209,7 +326,10 @@ class OptionsDictionary(object):
         if display:
             tab.display()
 
-        return str(tab)
+        tab_str = str(tab)
+        self._table_cache[cache_key] = (rows_key, tab_str)
+
+        return tab_str
 
     def __str__(self, width=100):
         """
@@ -284,15 +404,8 @@ class OptionsDictionary(object):
                     if isinstance(value, str):
                         value = "'{}'".format(value)
 
-                    if isinstance(types, (set, tuple, list)):
-                        typs = tuple([type_.__name__ for type_ in types])
-                        self._raise("Value ({}) of option '{}' has type '{}', but one of "
-                                    "types {} was expected.".format(value, name, vtype, typs),
-                                    exc_type=TypeError)
-                    else:
-                        self._raise("Value ({}) of option '{}' has type '{}', but type '{}' "
-                                    "was expected.".format(value, name, vtype, types.__name__),
-                                    exc_type=TypeError)
+                    self._raise(f"Value ({value}) of option '{name}' has type '{vtype}', but "
+                                f"{meta['expected_types']} was expected.", exc_type=TypeError)
 
             if upper is not None:
                 if value > upper:
@@ -328,22 +441,28 @@ class OptionsDictionary(object):
         """
         Provide a context manager for temporary option values within the context.
 
+        Only the options being changed are saved, and they are restored in reverse order on
+        exit, even if an exception is raised within the context.
+
         Parameters
         ----------
         **kwargs
             Keyword arguments where the option names in the OptionsDictionary are the keywords
             and the associated values are the temporary values for those options.
+
+        Yields
+        ------
+        None
         """
-        for option, val in kwargs.items():
-            if option not in self._context_cache:
-                self._context_cache[option] = []
-            self._context_cache[option].append(self[option])
-            self[option] = val
-        yield
-        for option, val in kwargs.items():
-            self[option] = self._context_cache[option].pop()
-            if len(self._context_cache[option]) == 0:
-                self._context_cache.pop(option)
+        saved = []
+        try:
+            for option, val in kwargs.items():
+                saved.append((option, self[option]))
+                self[option] = val
+            yield
+        finally:
+            for option, val in reversed(saved):
+                self[option] = val
 
     def declare(self, name, default=_UNDEFINED, values=None, types=None, desc='',
                 upper=None, lower=None, check_valid=None, allow_none=False, recordable=True,
@@ -442,7 +561,9 @@ class OptionsDictionary(object):
             'recordable': recordable,
             'set_function': set_function,
             'deprecation': deprecation,
+            'expected_types': _expected_types_str(types),
         }
+        self._valid_checks[name] = _make_valid_check(self._dict[name])
 
         # If a default is given, check for validity
         if default_provided:
@@ -459,6 +580,7 @@ class OptionsDictionary(object):
         """
         if name in self._dict:
             del self._dict[name]
+            self._valid_checks.pop(name, None)
 
     def update(self, in_dict):
         """
@@ -523,7 +645,14 @@ class OptionsDictionary(object):
         if meta['deprecation'] is not None:
             name, meta = self._handle_deprecation(name, meta)
 
-        self._assert_valid(name, value)
+        check = self._valid_checks.get(name)
+        if check is not None and check(value):
+            # the value is valid as far as the declaration goes, but still check_valid it
+            if meta['check_valid'] is not None:
+                meta['check_valid'](name, value)
+        else:
+            # do the full check, which raises the appropriate error if the value isn't valid
+            self._assert_valid(name, value)
 
         # General function test
         if meta['set_function'] is not None:
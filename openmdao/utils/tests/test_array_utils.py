@@ -3,7 +3,7 @@ import unittest
 import numpy as np
 
 from openmdao.utils.array_utils import array_connection_compatible, abs_complex, dv_abs_complex, \
-    convert_neg
+    convert_neg, scaled_row_gather, map_dist_indices
 from openmdao.utils.assert_utils import assert_near_equal
 
 
@@ -79,6 +79,30 @@ class TestArrayUtils(unittest.TestCase):
         self.assertTrue(np.all(inds[0] == np.array([0,2])))
         self.assertTrue(np.all(inds[1] == np.array([1,3])))
 
+    def test_scaled_row_gather(self):
+        a = np.arange(15, dtype=float).reshape((5, 3))
+        rows = np.array([4, 0, 2])
+        scale = np.array([1., -1., 2.])
+        out = np.empty((4, 3))
+
+        ret = scaled_row_gather(a, rows, scale, out[:3])
+
+        assert_near_equal(out[:3], a[rows] * scale[:, np.newaxis])
+        self.assertTrue(np.shares_memory(ret, out))
+
+    def test_map_dist_indices(self):
+        # variable has sizes 3, 0, 2 on ranks 0, 1, 2
+        sizes = np.array([3, 0, 2])
+        offsets = np.array([10, 20, 30])
+        inds = np.array([4, 0, 2, 3, 7])
+        out = np.full(inds.size, -1)
+
+        ret = map_dist_indices(inds, sizes, offsets, out)
+
+        # the out of range index 7 is left alone
+        np.testing.assert_array_equal(out, [31, 10, 12, 30, -1])
+        self.assertTrue(np.shares_memory(ret, out))
+
 
 if __name__ == "__main__":
     unittest.main()
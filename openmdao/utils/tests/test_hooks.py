@@ -1,5 +1,5 @@
+import functools
 import unittest
-import numpy as np
 
 import openmdao.api as om
 import openmdao.core.problem
@@ -7,6 +7,8 @@ import openmdao.utils.hooks as hooks
 from openmdao.utils.assert_utils import assert_near_equal
 
 
+# hook functions only depend on the name, so tests asking for the same name share one function
+@functools.lru_cache(maxsize=None)
 def make_hook(name):
     def hook_func(obj):
         obj.calls.append(name)
@@ -229,7 +231,7 @@ class HooksTestCase(unittest.TestCase):
                                         'pre_run_model', 'pre_final', 'post_final', 'post_run_model',
                                         ])
 
-        np.testing.assert_allclose(prob['comp.f_xy'], -6.0)
+        self.assertAlmostEqual(prob['comp.f_xy'][0], -6.0, places=10)
 
         hooks._unregister_hook('setup', 'Problem', pre=False)
         hooks._unregister_hook('final_setup', 'Problem')
@@ -1,25 +1,75 @@
 from functools import partial
+import os
+import sys
 import unittest
 
-import openmdao.api as om
 from openmdao.utils.assert_utils import assert_check_partials, assert_near_equal
 
 
+def _use_persistent_jax_cache(test, jax):
+    # If JAX_COMPILATION_CACHE_DIR is set, keep every compiled XLA executable in that dir so
+    # that later runs of the test don't have to compile them again.  The jax config is global,
+    # so the previous values are restored when the test finishes.
+    cache_dir = os.environ.get('JAX_COMPILATION_CACHE_DIR')
+    if not cache_dir:
+        return
+
+    settings = {
+        'jax_compilation_cache_dir': cache_dir,
+        'jax_persistent_cache_min_compile_time_secs': 0,
+        'jax_persistent_cache_min_entry_size_bytes': -1,
+    }
+    for name, val in settings.items():
+        try:
+            old = getattr(jax.config, name)
+        except AttributeError:
+            continue  # older versions of jax don't have this option
+        jax.config.update(name, val)
+        test.addCleanup(jax.config.update, name, old)
+
+
 class TestJaxUtils(unittest.TestCase):
 
     def test_jit_stub_no_jax(self):
         """Test the functionality of the jit stub."""
+        # make any import of jax fail, so this runs without jax even if it is installed
+        saved_jax = sys.modules.get('jax')
+        sys.modules['jax'] = None
+        try:
+            from openmdao.utils.jax_utils import jit_stub as jit, register_jax_component
+            import numpy as np
+
+            class TestClass(object):
+
+                @partial(jit, static_argnums=(0,))
+                def f(self, x):
+                    return np.sqrt(x)
+
+            x = np.linspace(0, 10, 11)
+            assert_near_equal(TestClass().f(x)**2, x)
+
+            with self.assertRaises(RuntimeError) as cm:
+                register_jax_component(TestClass)
+
+            self.assertEqual(str(cm.exception), "jax is not available. "
+                             "Try 'pip install openmdao[jax]' with Python>=3.8.")
+        finally:
+            if saved_jax is None:
+                del sys.modules['jax']
+            else:
+                sys.modules['jax'] = saved_jax
+
+    def test_jit_stub_no_wrapper(self):
+        """The jit stub should return the function itself, with or without arguments."""
         from openmdao.utils.jax_utils import jit_stub as jit
         import numpy as np
 
-        class TestClass(object):
-
-            @partial(jit, static_argnums=(0,))
-            def f(self, x):
-                return np.sqrt(x)
+        def f(x):
+            return np.sqrt(x)
 
-        x = np.linspace(0, 10, 11)
-        assert_near_equal(TestClass().f(x)**2, x)
+        self.assertIs(jit(f), f)
+        self.assertIs(partial(jit, static_argnums=(0,))(f), f)
+        self.assertIs(jit(static_argnums=(0,))(f), f)
 
     def test_jit_with_jax(self):
         """Make sure the jit stub test case also works with jax."""
@@ -48,6 +98,9 @@ class TestJaxUtils(unittest.TestCase):
         except ImportError:
             self.skipTest('jax is not available but required for this test.')
         import numpy as np
+        import openmdao.api as om
+
+        _use_persistent_jax_cache(self, jax)
 
         @om.register_jax_component
         class PowComp(om.ExplicitComponent):
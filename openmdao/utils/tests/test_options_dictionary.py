@@ -1,5 +1,6 @@
-from openmdao.api import OptionsDictionary
+from openmdao.utils.options_dictionary import OptionsDictionary
 
+import pickle
 import unittest
 
 from openmdao.utils.assert_utils import assert_warning, assert_no_warning
@@ -13,23 +14,32 @@ def check_even(name, value):
         raise ValueError("Option '%s' with value %s is not an even number." % (name, value))
 
 
+class MyComp(ExplicitComponent):
+    pass
+
+
 class TestOptionsDict(unittest.TestCase):
 
+    @classmethod
+    def setUpClass(cls):
+        # only used as an option default, so one instance can be shared by all the tests
+        cls._my_comp = MyComp()
+
     def setUp(self):
         self.dict = OptionsDictionary()
 
-    def test_reprs(self):
-        class MyComp(ExplicitComponent):
-            pass
-
-        my_comp = MyComp()
-
+    def _populate_standard(self, deprecation=None):
+        # declare the options used by the table tests
         self.dict.declare('test', values=['a', 'b'], desc='Test integer value')
         self.dict.declare('flag', default=False, types=bool)
-        self.dict.declare('comp', default=my_comp, types=ExplicitComponent)
+        self.dict.declare('comp', default=self._my_comp, types=ExplicitComponent)
         self.dict.declare('long_desc', types=str,
                           desc='This description is long and verbose, so it '
-                               'takes up multiple lines in the options table.')
+                               'takes up multiple lines in the options table.',
+                          deprecation=deprecation)
+
+    def test_reprs(self):
+        self._populate_standard()
 
         self.assertEqual(repr(self.dict), repr(self.dict._dict))
 
@@ -61,17 +71,7 @@ test       **Required**  ['a', 'b']         N/A                    Test integer
 """.strip())
 
     def test_to_table(self):
-        class MyComp(ExplicitComponent):
-            pass
-
-        my_comp = MyComp()
-
-        self.dict.declare('test', values=['a', 'b'], desc='Test integer value')
-        self.dict.declare('flag', default=False, types=bool)
-        self.dict.declare('comp', default=my_comp, types=ExplicitComponent)
-        self.dict.declare('long_desc', types=str,
-                          desc='This description is long and verbose, so it '
-                               'takes up multiple lines in the options table.')
+        self._populate_standard()
 
         expected = \
 """
@@ -84,19 +84,24 @@ test       **Required**  ['a', 'b']         N/A                    Test integer
 """
         self.assertEqual(self.dict.to_table(fmt='github').strip(), expected.strip())
 
-    def test_deprecation_col(self):
-        class MyComp(ExplicitComponent):
-            pass
+    def test_to_table_cache(self):
+        self.dict.declare('flag', default=False, types=bool)
+        self.dict.declare('size', default=3, types=int)
 
-        my_comp = MyComp()
+        table = self.dict.to_table(fmt='github', display=False)
+        self.assertIs(self.dict.to_table(fmt='github', display=False), table)
 
-        self.dict.declare('test', values=['a', 'b'], desc='Test integer value')
-        self.dict.declare('flag', default=False, types=bool)
-        self.dict.declare('comp', default=my_comp, types=ExplicitComponent)
-        self.dict.declare('long_desc', types=str,
-                          desc='This description is long and verbose, so it '
-                               'takes up multiple lines in the options table.',
-                          deprecation='This option is deprecated')
+        # changing an option must not give back the old table
+        self.dict['size'] = 4
+        new_table = self.dict.to_table(fmt='github', display=False)
+        self.assertNotEqual(new_table, table)
+        self.assertIn('| size   | 4 ', new_table)
+
+        self.dict.undeclare('flag')
+        self.assertNotIn('flag', self.dict.to_table(fmt='github', display=False))
+
+    def test_deprecation_col(self):
+        self._populate_standard(deprecation='This option is deprecated')
 
         expected = \
 """
@@ -110,14 +115,7 @@ test       **Required**  ['a', 'b']         N/A                    Test integer
 
         self.assertEqual(self.dict.to_table(fmt='github').strip(), expected.strip())
 
-        my_comp = MyComp()
-
-        self.dict.declare('test', values=['a', 'b'], desc='Test integer value')
-        self.dict.declare('flag', default=False, types=bool)
-        self.dict.declare('comp', default=my_comp, types=ExplicitComponent)
-        self.dict.declare('long_desc', types=str,
-                          desc='This description is long and verbose, so it '
-                               'takes up multiple lines in the options table.')
+        self._populate_standard()
 
         expected = \
 """
@@ -305,6 +303,29 @@ test       **Required**  ['a', 'b']         N/A                    Test integer
         expected_msg = "Value (-3.0) of option 'x' is less than minimum allowed value of 0.0."
         self.assertEqual(str(context.exception), expected_msg)
 
+    def test_checks_after_pickle(self):
+        self.dict.declare('x', default=1, types=int, lower=0)
+        self.dict.declare('y', default='a', values=['a', 'b'], allow_none=True)
+
+        dct = pickle.loads(pickle.dumps(self.dict))
+
+        dct['x'] = 2
+        dct['y'] = None
+        self.assertEqual(dct['x'], 2)
+        self.assertEqual(dct['y'], None)
+
+        with self.assertRaises(ValueError) as context:
+            dct['x'] = -1
+
+        expected_msg = "Value (-1) of option 'x' is less than minimum allowed value of 0."
+        self.assertEqual(str(context.exception), expected_msg)
+
+        with self.assertRaises(ValueError) as context:
+            dct['y'] = 'c'
+
+        expected_msg = "Value ('c') of option 'y' is not one of ['a', 'b']."
+        self.assertEqual(str(context.exception), expected_msg)
+
     def test_undeclare(self):
         # create an entry in the dict
         self.dict.declare('test', types=int)
@@ -415,6 +436,14 @@ test       **Required**  ['a', 'b']         N/A                    Test integer
         self.assertEqual(options['foo'], 'b')
         self.assertAlmostEqual(options['bar'], 3.14)
 
+        # values are restored if the context is left because of an exception
+        with self.assertRaises(RuntimeError):
+            with options.temporary(foo='c', bar=5):
+                raise RuntimeError('failed')
+
+        self.assertEqual(options['foo'], 'b')
+        self.assertAlmostEqual(options['bar'], 3.14)
+
     def test_call(self):
         options = OptionsDictionary()
         options.declare('foo', values=['a', 'b', 'c'], default=None, allow_none=True)
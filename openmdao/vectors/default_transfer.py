@@ -28,7 +28,7 @@ def _fill(arr, indices_iter):
         start = end
 
 
-def _setup_index_views(tot_size, in_xfers, out_xfers):
+def _setup_index_views(tot_size, in_xfers, out_xfers, dtype=INT_DTYPE):
     """
     Create index views for all subsystems and allocate full transfer arrays.
 
@@ -40,9 +40,11 @@ def _setup_index_views(tot_size, in_xfers, out_xfers):
         Mapping of subsystem name to input index arrays.
     out_xfers : dict
         Mapping of subsystem name to output index arrays.
+    dtype : dtype
+        Integer dtype of the full transfer arrays.
     """
-    full_in = np.empty(tot_size, dtype=INT_DTYPE)
-    full_out = np.empty(tot_size, dtype=INT_DTYPE)
+    full_in = np.empty(tot_size, dtype=dtype)
+    full_out = np.empty(tot_size, dtype=dtype)
 
     start = end = 0
     for sname, ranges in in_xfers.items():
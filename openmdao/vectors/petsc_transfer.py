@@ -2,9 +2,9 @@
 import numpy as np
 from openmdao.utils.mpi import check_mpi_env
 from openmdao.core.constants import INT_DTYPE
+from openmdao.utils.array_utils import map_dist_indices
 
 use_mpi = check_mpi_env()
-_empty_idx_array = np.array([], dtype=INT_DTYPE)
 
 
 if use_mpi is False:
@@ -19,10 +19,14 @@ else:
             raise ImportError("Importing petsc4py failed and OPENMDAO_USE_MPI is true.")
 
     from petsc4py import PETSc
-    from collections import defaultdict
 
+    from openmdao.utils.mpi import MPI
     from openmdao.vectors.default_transfer import DefaultTransfer, _setup_index_views
 
+    # Index arrays are built with PETSc's own int type (which depends on how PETSc was built)
+    # so that PETSc doesn't have to convert them when the index sets are created.
+    _petsc_int_dtype = np.dtype(PETSc.IntType)
+
     class PETScTransfer(DefaultTransfer):
         """
         PETSc Transfer implementation for running in parallel.
@@ -39,23 +43,38 @@ else:
             Output indices for the transfer.
         comm : MPI.Comm or <FakeComm>
             Communicator of the system that owns this transfer.
+        local : bool
+            If True, the indices on every proc are within that proc's part of the vectors, so the
+            transfer is done with numpy instead of a PETSc scatter.  Must be the same on all procs.
 
         Attributes
         ----------
-        _scatter : method
+        _scatter : method or None
             Method that performs a PETSc scatter.
+        _local_xfer : <DefaultTransfer> or None
+            Transfer using local indices, used instead of a PETSc scatter when no proc needs
+            any data from another proc.
         """
 
-        def __init__(self, in_vec, out_vec, in_inds, out_inds, comm):
+        def __init__(self, in_vec, out_vec, in_inds, out_inds, comm, local=False):
             """
             Initialize all attributes.
             """
             super().__init__(in_vec, out_vec, in_inds, out_inds)
-            in_indexset = PETSc.IS().createGeneral(self._in_inds, comm=comm)
-            out_indexset = PETSc.IS().createGeneral(self._out_inds, comm=comm)
 
-            self._scatter = PETSc.Scatter().create(out_vec._petsc, out_indexset, in_vec._petsc,
-                                                   in_indexset).scatter
+            if local:
+                in_start = in_vec._petsc.getOwnershipRange()[0]
+                out_start = out_vec._petsc.getOwnershipRange()[0]
+                self._local_xfer = DefaultTransfer(in_vec, out_vec, self._in_inds - in_start,
+                                                   self._out_inds - out_start)
+                self._scatter = None
+            else:
+                self._local_xfer = None
+                in_indexset = PETSc.IS().createGeneral(self._in_inds, comm=comm)
+                out_indexset = PETSc.IS().createGeneral(self._out_inds, comm=comm)
+
+                self._scatter = PETSc.Scatter().create(out_vec._petsc, out_indexset,
+                                                       in_vec._petsc, in_indexset).scatter
 
         @staticmethod
         def _setup_transfers(group):
@@ -89,8 +108,8 @@ else:
             offsets_in = group._get_var_offsets()['input'][myrank, :]
             mypathlen = len(group.pathname) + 1 if group.pathname else 0
 
-            xfer_in = defaultdict(list)
-            xfer_out = defaultdict(list)
+            xfer_in = {}
+            xfer_out = {}
 
             allprocs_abs2idx = group._var_allprocs_abs2idx
             sizes_in = group._var_sizes['input'][myrank, :]
@@ -101,6 +120,11 @@ else:
             for abs_in, abs_out in group._conn_abs_in2out.items():
                 sub_in = abs_in[mypathlen:].partition('.')[0]
 
+                # every proc needs the same entries in the transfer dicts, in the same order,
+                # even for inputs that aren't local, to avoid hangs
+                sub_xfer_in = xfer_in.setdefault(sub_in, [])
+                sub_xfer_out = xfer_out.setdefault(sub_in, [])
+
                 # Only continue if the input exists on this processor
                 if abs_in in abs2meta_in:
 
@@ -111,26 +135,37 @@ else:
 
                     total_len += len(input_inds)
 
-                    xfer_in[sub_in].append(input_inds)
-                    xfer_out[sub_in].append(output_inds)
-                else:
-                    # not a local input but still need entries in the transfer dicts to
-                    # avoid hangs
-                    xfer_in[sub_in]  # defaultdict will create an empty list there
-                    xfer_out[sub_in]
+                    sub_xfer_in.append(input_inds)
+                    sub_xfer_out.append(output_inds)
 
             if xfer_in:
-                full_xfer_in, full_xfer_out = _setup_index_views(total_len, xfer_in, xfer_out)
+                full_xfer_in, full_xfer_out = _setup_index_views(total_len, xfer_in, xfer_out,
+                                                                 _petsc_int_dtype)
+
+                # The subsystem transfers are parts of the full transfer, so if the full transfer
+                # is local on every proc, they are too.  Scatters are collective, so the check
+                # must give the same answer on all procs.
+                local = _is_local(group._vectors, full_xfer_in, full_xfer_out)
+                local = group.comm.allreduce(int(not local), op=MPI.SUM) == 0
+
                 # full transfer (transfer to all subsystems at once)
                 transfers[None] = PETScTransfer(group._vectors['input']['nonlinear'],
                                                 group._vectors['output']['nonlinear'],
-                                                full_xfer_in, full_xfer_out, group.comm)
+                                                full_xfer_in, full_xfer_out, group.comm, local)
 
                 # transfers to individual subsystems
-                for sname, inds in xfer_in.items():
-                    transfers[sname] = PETScTransfer(group._vectors['input']['nonlinear'],
-                                                     group._vectors['output']['nonlinear'],
-                                                     inds, xfer_out[sname], group.comm)
+                if len(xfer_in) == 1:
+                    # the only subsystem transfer has the same indices as the full transfer, so
+                    # share it instead of having PETSc build an identical scatter.  The subsystem
+                    # keys are the same on all procs, so every proc makes the same choice.
+                    for sname in xfer_in:
+                        transfers[sname] = transfers[None]
+                else:
+                    for sname, inds in xfer_in.items():
+                        transfers[sname] = PETScTransfer(group._vectors['input']['nonlinear'],
+                                                         group._vectors['output']['nonlinear'],
+                                                         inds, xfer_out[sname], group.comm,
+                                                         local)
 
             return transfers
 
@@ -177,22 +212,40 @@ else:
 
             has_par_coloring = group._problem_meta['has_par_deriv_color']
 
-            xfer_in = defaultdict(list)
-            xfer_out = defaultdict(list)
+            xfer_in = {}
+            xfer_out = {}
 
             # xfers that are only active when parallel coloring is not
-            xfer_in_nocolor = defaultdict(list)
-            xfer_out_nocolor = defaultdict(list)
+            xfer_in_nocolor = {}
+            xfer_out_nocolor = {}
 
+            owning_rank = group._owning_rank
             sizes_in = group._var_sizes['input']
+            sizes_out = group._var_sizes['output']
             offsets_in = offsets['input']
             offsets_out = offsets['output']
 
             total_size = total_size_nocolor = 0
 
+            # duplication info for all variables, computed once rather than once per connection
+            all_inp_is_dup, all_inp_missing, all_distrib_in = _get_dup_info(group, 'input')
+            all_out_is_dup, _, all_distrib_out = _get_dup_info(group, 'output')
+
+            # an output may be connected to many inputs, so keep its subsystem name around
+            # rather than splitting the output name again for every connection.
+            sub_of_out = {}
+
             # Loop through all connections owned by this system
             for abs_in, abs_out in group._conn_abs_in2out.items():
-                sub_out = abs_out[mypathlen:].partition('.')[0]
+                try:
+                    sub_out = sub_of_out[abs_out]
+                except KeyError:
+                    sub_out = sub_of_out[abs_out] = abs_out[mypathlen:].partition('.')[0]
+
+                # every proc needs the same entries in the transfer dicts, in the same order,
+                # even for inputs that aren't local, to avoid hangs
+                sub_xfer_in = xfer_in.setdefault(sub_out, [])
+                sub_xfer_out = xfer_out.setdefault(sub_out, [])
 
                 # Only continue if the input exists on this processor
                 if abs_in in abs2meta_in:
@@ -207,32 +260,28 @@ else:
                                        offsets_in[myrank, idx_in] + sizes_in[myrank, idx_in])
 
                     # Now the indices are ready - input_inds, output_inds
-                    inp_is_dup, inp_missing, distrib_in = group.get_var_dup_info(abs_in, 'input')
-                    out_is_dup, _, distrib_out = group.get_var_dup_info(abs_out, 'output')
+                    inp_is_dup = all_inp_is_dup[idx_in]
+                    inp_missing = all_inp_missing[idx_in]
+                    distrib_in = all_distrib_in[idx_in]
+                    out_is_dup = all_out_is_dup[idx_out]
+                    distrib_out = all_distrib_out[idx_out]
 
-                    iowninput = myrank == group._owning_rank[abs_in]
+                    iowninput = myrank == owning_rank[abs_in]
 
                     if inp_is_dup and (abs_out not in abs2meta_out or
                                        (distrib_out and not iowninput)):
-                        xfer_in[sub_out]
-                        xfer_out[sub_out]
+                        pass  # nothing to transfer, but the empty entries were added above
                     elif out_is_dup and inp_missing > 0 and (iowninput or distrib_in):
                         # if this rank owns the input or the input is distributed,
                         # and the output is duplicated, then we send the owning/distrib input
                         # to each duplicated output that doesn't have a corresponding connected
                         # input on the same rank.
                         oidxlist = []
-                        iidxlist = []
                         oidxlist_nc = []
-                        iidxlist_nc = []
-                        size = size_nc = 0
-                        for rnk, osize, isize in zip(range(group.comm.size),
-                                                     group.get_var_sizes(abs_out, 'output'),
-                                                     group.get_var_sizes(abs_in, 'input')):
+                        for rnk, (osize, isize) in enumerate(zip(sizes_out[:, idx_out],
+                                                                 sizes_in[:, idx_in])):
                             if rnk == myrank:  # transfer to output on same rank
                                 oidxlist.append(output_inds)
-                                iidxlist.append(input_inds)
-                                size += len(input_inds)
                             elif osize > 0 and isize == 0:
                                 # dup output exists on this rank but there is no corresponding
                                 # input, so we send the owning/distrib input to the dup output
@@ -248,39 +297,25 @@ else:
                                     # these transfers will only happen if parallel coloring is
                                     # not active for the current seed response
                                     oidxlist_nc.append(oarr)
-                                    iidxlist_nc.append(input_inds)
-                                    size_nc += len(input_inds)
                                 else:
                                     oidxlist.append(oarr)
-                                    iidxlist.append(input_inds)
-                                    size += len(input_inds)
 
-                        if len(iidxlist) > 1:
-                            input_inds = _merge(iidxlist, size)
-                            output_inds = _merge(oidxlist, size)
-                        else:
-                            input_inds = iidxlist[0]
-                            output_inds = oidxlist[0]
+                        # Every entry is paired with the same input_inds.  The entries are
+                        # copied straight into the full transfer arrays by _setup_index_views,
+                        # so they're not merged into intermediate arrays here.
+                        total_size += len(input_inds) * len(oidxlist)
 
-                        total_size += len(input_inds)
-
-                        xfer_in[sub_out].append(input_inds)
-                        xfer_out[sub_out].append(output_inds)
+                        sub_xfer_in.extend([input_inds] * len(oidxlist))
+                        sub_xfer_out.extend(oidxlist)
 
-                        if has_par_coloring and iidxlist_nc:
+                        if has_par_coloring and oidxlist_nc:
                             # keep transfers separate that shouldn't happen when parallel
                             # deriv coloring is active
-                            if len(iidxlist_nc) > 1:
-                                input_inds = _merge(iidxlist_nc, size_nc)
-                                output_inds = _merge(oidxlist_nc, size_nc)
-                            else:
-                                input_inds = iidxlist_nc[0]
-                                output_inds = oidxlist_nc[0]
-
-                            total_size_nocolor += len(input_inds)
+                            total_size_nocolor += len(input_inds) * len(oidxlist_nc)
 
-                            xfer_in_nocolor[sub_out].append(input_inds)
-                            xfer_out_nocolor[sub_out].append(output_inds)
+                            xfer_in_nocolor.setdefault(sub_out, []).extend(
+                                [input_inds] * len(oidxlist_nc))
+                            xfer_out_nocolor.setdefault(sub_out, []).extend(oidxlist_nc)
                     else:
                         if (inp_is_dup and out_is_dup and src_indices is not None and
                                 src_indices.size > 0):
@@ -289,44 +324,66 @@ else:
 
                         total_size += len(input_inds)
 
-                        xfer_in[sub_out].append(input_inds)
-                        xfer_out[sub_out].append(output_inds)
-                else:
-                    # remote input but still need entries in the transfer dicts to avoid hangs
-                    xfer_in[sub_out]
-                    xfer_out[sub_out]
-                    if has_par_coloring:
-                        xfer_in_nocolor[sub_out]
-                        xfer_out_nocolor[sub_out]
+                        sub_xfer_in.append(input_inds)
+                        sub_xfer_out.append(output_inds)
+                elif has_par_coloring:
+                    # remote input but still need nocolor entries to avoid hangs
+                    xfer_in_nocolor.setdefault(sub_out, [])
+                    xfer_out_nocolor.setdefault(sub_out, [])
+
+            full_xfer_in, full_xfer_out = _setup_index_views(total_size, xfer_in, xfer_out,
+                                                             _petsc_int_dtype)
+
+            # As in fwd, the subsystem transfers are local on every proc if the full transfer is,
+            # and the answer must be the same on all procs.  With parallel coloring, the same
+            # reduction also finds out if the nocolor transfers are local and if any proc has
+            # nocolor indices at all.
+            nonlocal_count = int(not _is_local(vectors, full_xfer_in, full_xfer_out))
+            if has_par_coloring:
+                nc_xfer_in, nc_xfer_out = _setup_index_views(total_size_nocolor,
+                                                             xfer_in_nocolor, xfer_out_nocolor,
+                                                             _petsc_int_dtype)
+                counts = np.array([nonlocal_count,
+                                   int(not _is_local(vectors, nc_xfer_in, nc_xfer_out)),
+                                   total_size_nocolor])
+                nonlocal_count, nonlocal_count_nc, global_size_nocolor = \
+                    group.comm.allreduce(counts, op=MPI.SUM)
+            else:
+                nonlocal_count = group.comm.allreduce(nonlocal_count, op=MPI.SUM)
 
-            full_xfer_in, full_xfer_out = _setup_index_views(total_size, xfer_in, xfer_out)
+            local = nonlocal_count == 0
 
             transfers = {
                 None: PETScTransfer(vectors['input']['nonlinear'],
                                     vectors['output']['nonlinear'],
-                                    full_xfer_in, full_xfer_out, group.comm)
+                                    full_xfer_in, full_xfer_out, group.comm, local)
             }
 
-            for sname, inds in xfer_out.items():
-                transfers[sname] = PETScTransfer(vectors['input']['nonlinear'],
-                                                 vectors['output']['nonlinear'],
-                                                 xfer_in[sname], inds, group.comm)
+            if len(xfer_out) == 1:
+                # share the full transfer with the only subsystem transfer (see fwd)
+                for sname in xfer_out:
+                    transfers[sname] = transfers[None]
+            else:
+                for sname, inds in xfer_out.items():
+                    transfers[sname] = PETScTransfer(vectors['input']['nonlinear'],
+                                                     vectors['output']['nonlinear'],
+                                                     xfer_in[sname], inds, group.comm, local)
 
-            if xfer_in_nocolor:
-                full_xfer_in, full_xfer_out = _setup_index_views(total_size_nocolor,
-                                                                 xfer_in_nocolor,
-                                                                 xfer_out_nocolor)
+            # Only create the nocolor transfers if some proc has nocolor indices to transfer.
+            # global_size_nocolor is summed over all procs, so all procs agree.
+            if has_par_coloring and global_size_nocolor > 0:
+                local = nonlocal_count_nc == 0
 
                 transfers[(None, '@nocolor')] = PETScTransfer(vectors['input']['nonlinear'],
                                                               vectors['output']['nonlinear'],
-                                                              full_xfer_in, full_xfer_out,
-                                                              group.comm)
+                                                              nc_xfer_in, nc_xfer_out,
+                                                              group.comm, local)
 
                 for sname, inds in xfer_out_nocolor.items():
                     transfers[(sname, '@nocolor')] = PETScTransfer(vectors['input']['nonlinear'],
                                                                    vectors['output']['nonlinear'],
                                                                    xfer_in_nocolor[sname], inds,
-                                                                   group.comm)
+                                                                   group.comm, local)
 
             return transfers
 
@@ -343,6 +400,19 @@ else:
             mode : str
                 'fwd' or 'rev'.
             """
+            if self._local_xfer is not None:
+                xfer = self._local_xfer
+                if mode == 'rev' and in_vec._under_complex_step:
+                    # np.bincount (used by DefaultTransfer in rev) doesn't take complex weights,
+                    # so accumulate the real and imaginary parts separately.
+                    data = in_vec._get_data()[xfer._in_inds]
+                    size = out_vec._data.size
+                    out_vec.iadd(np.bincount(xfer._out_inds, data.real, minlength=size) +
+                                 np.bincount(xfer._out_inds, data.imag, minlength=size) * 1j)
+                else:
+                    xfer._transfer(in_vec, out_vec, mode)
+                return
+
             flag = False
             if mode == 'rev':
                 flag = True
@@ -367,7 +437,10 @@ else:
                 out_petsc_imag.array = out_vec._data.imag
                 self._scatter(out_petsc_imag, in_petsc_imag, addv=flag, mode=flag)
 
-                in_vec._data[:] = in_petsc.array + in_petsc_imag.array * 1j
+                # write the parts back in place to avoid building a temporary complex array
+                data = in_vec._data
+                data.real[:] = in_petsc.array
+                data.imag[:] = in_petsc_imag.array
 
             else:
 
@@ -387,33 +460,80 @@ else:
                     data[:] = in_petsc.array
 
 
-def _merge(inds_list, tot_size):
+def _is_local(vectors, in_inds, out_inds):
+    """
+    Return True if all transfer indices are within this proc's part of the vectors.
+
+    Parameters
+    ----------
+    vectors : dict
+        The group's vectors.
+    in_inds : ndarray
+        Input indices of the transfer.
+    out_inds : ndarray
+        Output indices of the transfer.
+
+    Returns
+    -------
+    bool
+        True if no data from another proc is needed for the transfer on this proc.
     """
-    Convert a list of indices and/or ranges into an array.
+    in_start, in_end = vectors['input']['nonlinear']._petsc.getOwnershipRange()
+    out_start, out_end = vectors['output']['nonlinear']._petsc.getOwnershipRange()
+    return _all_in_range(in_inds, in_start, in_end) and \
+        _all_in_range(out_inds, out_start, out_end)
+
+
+def _all_in_range(inds, start, end):
+    """
+    Return True if all of the given indices are in the range [start, end).
 
     Parameters
     ----------
-    inds_list : list of ranges or ndarrays
-        List of indices.
-    tot_size : int
-        Total size of the indices in the list.
+    inds : ndarray
+        Indices to be checked.
+    start : int
+        Start of the range.
+    end : int
+        End of the range (not inclusive).
 
     Returns
     -------
-    ndarray
-        Array of indices.
+    bool
+        True if all indices are in the range.
     """
-    if inds_list:
-        arr = np.empty(tot_size, dtype=INT_DTYPE)
-        start = end = 0
-        for inds in inds_list:
-            end += len(inds)
-            arr[start:end] = inds
-            start = end
+    return inds.size == 0 or (inds.min() >= start and inds.max() < end)
 
-        return arr
 
-    return _empty_idx_array
+def _get_dup_info(group, io):
+    """
+    Return how each variable of the given type is duplicated across MPI processes.
+
+    This is the same information as System.get_var_dup_info, but for all variables at once.
+
+    Parameters
+    ----------
+    group : <Group>
+        Group owning the variables.
+    io : str
+        Either 'input' or 'output'.
+
+    Returns
+    -------
+    ndarray of bool
+        Whether each variable is duplicated.
+    ndarray of int
+        Number of procs where each variable has zero size.
+    ndarray of bool
+        Whether each variable is distributed.
+    """
+    sizes = group._var_sizes[io]
+    nz = np.count_nonzero(sizes, axis=0)
+    distrib = np.array([meta['distributed'] for meta in group._var_allprocs_abs2meta[io].values()],
+                       dtype=bool)
+
+    # distributed vars are never dups
+    return np.logical_and(nz > 1, ~distrib), sizes.shape[0] - nz, distrib
 
 
 def _get_output_inds(group, abs_out, abs_in):
@@ -454,20 +574,7 @@ def _get_output_inds(group, abs_out, abs_in):
             offset = offsets[rank]
             output_inds = range(offset, offset + sizes[rank])
     else:
-        output_inds = np.empty(src_indices.size, INT_DTYPE)
-        start = end = 0
-        for iproc in range(group.comm.size):
-            end += sizes[iproc]
-            if start == end:
-                continue
-
-            # The part of src on iproc
-            on_iproc = np.logical_and(start <= src_indices, src_indices < end)
-
-            if np.any(on_iproc):
-                # This converts from global to variable specific ordering
-                output_inds[on_iproc] = src_indices[on_iproc] + (offsets[iproc] - start)
-
-            start = end
+        output_inds = map_dist_indices(src_indices, sizes, offsets,
+                                       np.empty(src_indices.size, INT_DTYPE))
 
     return output_inds, orig_src_inds